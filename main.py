@@ -4,6 +4,8 @@ import subprocess
 import shutil
 import tempfile
 import json
+import hashlib
+import io
 import threading
 import re
 import time
@@ -29,6 +31,7 @@ os.environ["PYWEBVIEW_CHROMIUM_FLAGS"] = "--no-sandbox --disable-gpu"
 
 
 import webview
+import bsdiff4
 from bs4 import BeautifulSoup
 
 FILE_NAME = "UBahnSimBerlin_Gesamt.pak"
@@ -38,13 +41,30 @@ WEBSITE_URL = "https://www.u7-trainz.de/downloads"
 GAME_DIR_NAME = "SubwaySim 2"
 MODS_DIR_NAME = "Mods"
 STATUS_FILE = "mod_status.json"
+SETTINGS_FILE = "installer_settings.json"
+STATE_FILE = "installer_state.json"
+STATE_DIR_NAME = "SubwaySim2_USB_Installer"
+STATE_SAVE_DELAY = 1.0
+
+DEFAULT_SETTINGS = {
+    "tracking": False,
+    "sound": True,
+    "language": "de"
+}
 
 DOWNLOAD_CHUNK_SIZE = 8192
 DOWNLOAD_TIMEOUT = 60
 DOWNLOAD_PROGRESS_INTERVAL = 2.0
+DOWNLOAD_PROGRESS_MESSAGES = ("download_started", "downloading_from_server_percent", "downloading_from_server_mb")
+INSTALLER_UPDATE_PROGRESS_MESSAGES = (
+    "installer_update_download_started",
+    "installer_update_downloading_percent",
+    "installer_update_downloading_mb"
+)
 
 INSTALLER_VERSION = "1.0"
 INSTALLER_UPDATE_INFO_URL = "https://onejanik.xyz/sws2_usb_installer/version.json"
+INSTALLER_UPDATE_DIR_NAME = "updates"
 
 DEFAULT_LANGUAGE = "de"
 
@@ -65,7 +85,17 @@ MESSAGES = {
         "installation_complete_saving": "Installation abgeschlossen. Version wird gespeichert...",
         "installation_failed": "Installation fehlgeschlossen: {error}",
         "restoring_backup": "Installation abgebrochen. Ursprüngliche Dateien werden wiederhergestellt...",
-        "cleanup_temp": "Temporäre Dateien werden aufgeräumt..."
+        "cleanup_temp": "Temporäre Dateien werden aufgeräumt...",
+        "installer_update_downloading": "Neuer Installer wird heruntergeladen...",
+        "installer_update_download_started": "Installer-Download gestartet ({size_mb} MB)",
+        "installer_update_downloading_percent": "Neuer Installer wird heruntergeladen... {percent}%",
+        "installer_update_downloading_mb": "Neuer Installer wird heruntergeladen... {mb} MB",
+        "installer_update_downloading_patch": "Update-Patch wird heruntergeladen...",
+        "installer_update_applying_patch": "Update-Patch wird angewendet...",
+        "installer_update_verifying": "Installer wird überprüft...",
+        "installer_update_verify_failed": "Der heruntergeladene Installer ist beschädigt.",
+        "installer_update_starting": "Neuer Installer wird gestartet...",
+        "installer_update_failed": "Installer-Update fehlgeschlagen: {error}"
     },
     "en": {
         "no_game_folder": "No game folder selected or found.",
@@ -83,11 +113,139 @@ MESSAGES = {
         "installation_complete_saving": "Installation complete. Saving version...",
         "installation_failed": "Installation failed: {error}",
         "restoring_backup": "Installation cancelled. Restoring original files...",
-        "cleanup_temp": "Cleaning up temporary files..."
+        "cleanup_temp": "Cleaning up temporary files...",
+        "installer_update_downloading": "Downloading new installer...",
+        "installer_update_download_started": "Installer download started ({size_mb} MB)",
+        "installer_update_downloading_percent": "Downloading new installer... {percent}%",
+        "installer_update_downloading_mb": "Downloading new installer... {mb} MB",
+        "installer_update_downloading_patch": "Downloading update patch...",
+        "installer_update_applying_patch": "Applying update patch...",
+        "installer_update_verifying": "Verifying installer...",
+        "installer_update_verify_failed": "The downloaded installer is corrupted.",
+        "installer_update_starting": "Starting new installer...",
+        "installer_update_failed": "Installer update failed: {error}"
     }
 }
 
 
+def get_state_dir():
+    local_app_data = os.getenv('LOCALAPPDATA')
+    if local_app_data:
+        return Path(local_app_data) / STATE_DIR_NAME
+    return Path.home() / ".local" / "share" / STATE_DIR_NAME
+
+
+class StateStore:
+    def __init__(self, state_dir):
+        self.state_dir = Path(state_dir)
+        self.path = self.state_dir / STATE_FILE
+        self._data = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer = None
+        self._disk_signature = None
+        self._load()
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._reload_if_changed()
+            return self._data.get(key, default)
+
+    def update(self, **values):
+        with self._lock:
+            self._data.update(values)
+            self._dirty = True
+            self._schedule_save()
+
+    def flush(self):
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            try:
+                self._write_atomic()
+                self._dirty = False
+            except OSError as e:
+                print(f"Error writing state file: {e}")
+
+    def _signature(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _load(self):
+        signature = self._signature()
+        if signature is None:
+            self._data = self._load_legacy()
+            if self._data:
+                self._dirty = True
+                self.flush()
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self._data = data if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Error loading state file: {e}")
+            self._data = {}
+        self._disk_signature = signature
+
+    def _load_legacy(self):
+        data = {}
+        legacy_status = self.state_dir / STATUS_FILE
+        if legacy_status.exists():
+            try:
+                with open(legacy_status, 'r') as f:
+                    data.update(json.load(f))
+            except Exception as e:
+                print(f"Error migrating status file: {e}")
+
+        legacy_settings = Path(SETTINGS_FILE)
+        if legacy_settings.exists():
+            try:
+                with open(legacy_settings, 'r') as f:
+                    data["settings"] = json.load(f)
+            except Exception as e:
+                print(f"Error migrating settings file: {e}")
+        return data
+
+    def _reload_if_changed(self):
+        if self._dirty:
+            return
+        signature = self._signature()
+        if signature is not None and signature != self._disk_signature:
+            self._load()
+
+    def _schedule_save(self):
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(STATE_SAVE_DELAY, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _write_atomic(self):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=STATE_FILE, suffix=".tmp", dir=self.state_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._disk_signature = self._signature()
+
+
 class Api:
     def __init__(self):
         self.window = None
@@ -96,6 +254,8 @@ class Api:
         self.install_thread = None
         self.backup_file_path = None
         self.language = DEFAULT_LANGUAGE
+        self.state = StateStore(get_state_dir())
+        self.installer_update_info = None
 
     def _msg(self, key, **kwargs):
         lang = self.language or DEFAULT_LANGUAGE
@@ -141,31 +301,31 @@ class Api:
         self.selected_game_folder = game_folder
         mods_folder = game_folder / MODS_DIR_NAME
         mod_file_path = mods_folder / FILE_NAME
-        status_file_path = self._get_status_file_path(mods_folder)
         legacy_status_file_path = mods_folder / STATUS_FILE
 
-        local_version = None
-        file_exists = mod_file_path.exists()
+        local_version = self.state.get("installed_version")
+        try:
+            mod_stat = mod_file_path.stat()
+        except OSError:
+            mod_stat = None
+        file_exists = mod_stat is not None
 
-        if status_file_path.exists():
-            try:
-                with open(status_file_path, 'r') as f:
-                    local_version = json.load(f).get("installed_version")
-            except Exception:
-                pass
-        elif legacy_status_file_path.exists():
+        if not local_version and legacy_status_file_path.exists():
             try:
                 with open(legacy_status_file_path, 'r') as f:
-                    data = json.load(f)
-                    local_version = data.get("installed_version")
-                try:
-                    status_file_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(status_file_path, 'w') as f:
-                        json.dump(data, f, indent=2)
-                except Exception as e:
-                    print(f"Error migrating status file to LocalAppData: {e}")
-            except Exception:
-                pass
+                    local_version = json.load(f).get("installed_version")
+                if local_version:
+                    self.state.update(installed_version=local_version)
+            except Exception as e:
+                print(f"Error migrating status file: {e}")
+
+        if file_exists and local_version:
+            recorded_size = self.state.get("mod_size")
+            recorded_mtime = self.state.get("mod_mtime_ns")
+            if recorded_size is not None and recorded_mtime is not None:
+                if (mod_stat.st_size, mod_stat.st_mtime_ns) != (recorded_size, recorded_mtime):
+                    print("Mod file changed since installation, version unknown")
+                    local_version = None
 
         if file_exists and not local_version:
             local_version = "Unknown"
@@ -197,6 +357,7 @@ class Api:
                 return {"error": "Wrong folder name."}
 
             self.selected_game_folder = folder_path
+            self.state.update(game_path=str(folder_path))
             return self.get_status()
         except Exception as e:
             return {"error": str(e)}
@@ -253,31 +414,21 @@ class Api:
             return {"error": str(e)}
 
     def get_settings(self):
-        try:
-            settings_file = Path("installer_settings.json")
-            if settings_file.exists():
-                with open(settings_file, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-
-        return {
-            "tracking": False,
-            "sound": True,
-            "language": "de"
-        }
+        settings = dict(DEFAULT_SETTINGS)
+        stored = self.state.get("settings")
+        if isinstance(stored, dict):
+            settings.update(stored)
+        return settings
 
     def save_settings(self, settings):
-        try:
-            with open("installer_settings.json", 'w') as f:
-                json.dump(settings, f, indent=2)
-            return {"success": True}
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-            return {"error": str(e)}
+        if not isinstance(settings, dict):
+            return {"error": "Invalid settings."}
+        self.state.update(settings=dict(settings))
+        return {"success": True}
 
     def close_app(self):
         self.installation_cancelled = True
+        self.state.flush()
         if self.window:
             self.window.destroy()
 
@@ -285,20 +436,21 @@ class Api:
         try:
             resp = requests.get(INSTALLER_UPDATE_INFO_URL, timeout=10)
             resp.raise_for_status()
-            info = resp.json()
-
-            remote_version = str(info.get("version", "")).strip()
-            download_url = info.get("url")
+            info = self._parse_installer_update_info(resp.json())
 
-            if not remote_version or not download_url:
+            if not info:
                 return {
                     "error": True,
                     "message": "Invalid update info from server."
                 }
 
+            remote_version = info["version"]
+            download_url = info["url"]
+
             cmp = self._compare_versions(remote_version, INSTALLER_VERSION)
 
             if cmp > 0:
+                self.installer_update_info = info
                 return {
                     "update_available": True,
                     "local": INSTALLER_VERSION,
@@ -317,40 +469,78 @@ class Api:
                 "message": f"Error checking installer update: {e}"
             }
 
+    def _parse_installer_update_info(self, info):
+        if not isinstance(info, dict):
+            return None
+
+        version = str(info.get("version", "")).strip()
+        url = info.get("url")
+        if not version or not isinstance(url, str) or not url:
+            return None
+
+        sha256 = self._parse_sha256(info.get("sha256"))
+        if sha256 is False:
+            return None
+
+        size = info.get("size")
+        if size is not None:
+            if isinstance(size, bool):
+                return None
+            try:
+                size = int(size)
+            except (TypeError, ValueError):
+                return None
+            if size < 0:
+                return None
+
+        patches = {}
+        raw_patches = info.get("patches")
+        if isinstance(raw_patches, dict):
+            for from_version, patch in raw_patches.items():
+                if not isinstance(patch, dict) or not isinstance(patch.get("url"), str):
+                    continue
+                patch_sha256 = self._parse_sha256(patch.get("sha256"))
+                if patch_sha256 is False:
+                    continue
+                patches[str(from_version)] = {"url": patch["url"], "sha256": patch_sha256}
+
+        return {
+            "version": version,
+            "url": url,
+            "sha256": sha256,
+            "size": size,
+            "patches": patches
+        }
+
+    def _parse_sha256(self, value):
+        if value is None:
+            return None
+        if not isinstance(value, str) or not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            return False
+        return value.lower()
+
     def update_installer(self, download_url, filename=None):
         if not download_url:
             return {"error": True, "message": "No download URL provided."}
 
-        try:
-            if filename is None:
-                filename = os.path.basename(download_url) or "installer_new.exe"
-
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmp_path = Path(tmpdir) / filename
-
-                with requests.get(download_url, stream=True, timeout=60) as r:
-                    r.raise_for_status()
-                    with open(tmp_path, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if not chunk:
-                                continue
-                            f.write(chunk)
-
-                if os.name == "nt":
-                    subprocess.Popen(
-                        ["start", "", str(tmp_path)],
-                        shell=True
-                    )
-                else:
-                    subprocess.Popen(
-                        ["xdg-open", str(tmp_path)],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL
-                    )
+        if self.install_thread and self.install_thread.is_alive():
+            return {"error": True, "message": self._msg("installation_already_running")}
 
-            os._exit(0)
-        except Exception as e:
-            return {"error": True, "message": f"Error updating installer: {e}"}
+        info = self.installer_update_info or {}
+        if info.get("url") != download_url:
+            info = {"url": download_url}
+
+        if filename is None:
+            filename = os.path.basename(download_url) or "installer_new.exe"
+
+        self.installation_cancelled = False
+        self.install_thread = threading.Thread(
+            target=self._do_installer_update_task,
+            args=(info, filename),
+            daemon=True
+        )
+        self.install_thread.start()
+        return {"success": True, "message": "Installer update started..."}
 
     def _find_game_folder(self):
         if self.selected_game_folder and self.selected_game_folder.exists():
@@ -358,6 +548,10 @@ class Api:
 
         possible_paths = []
 
+        stored_path = self.state.get("game_path")
+        if stored_path:
+            possible_paths.append(Path(stored_path))
+
         if os.name == 'nt':
             user_profile = os.environ.get('USERPROFILE', '')
             if user_profile:
@@ -374,6 +568,8 @@ class Api:
             try:
                 if path.is_dir():
                     print(f"Game folder found: {path}")
+                    if str(path) != stored_path:
+                        self.state.update(game_path=str(path))
                     return path
             except Exception as e:
                 print(f"Error checking {path}: {e}")
@@ -382,19 +578,6 @@ class Api:
         print("Game folder not found in any standard paths")
         return None
 
-    def _get_status_file_path(self, mods_folder=None):
-        local_app_data = os.getenv('LOCALAPPDATA')
-        if local_app_data:
-            base = Path(local_app_data) / "SubwaySim2_USB_Installer"
-            try:
-                base.mkdir(parents=True, exist_ok=True)
-            except OSError as e:
-                print(f"Error creating LocalAppData status folder: {e}")
-            return base / STATUS_FILE
-        if mods_folder is not None:
-            return mods_folder / STATUS_FILE
-        return Path(STATUS_FILE)
-
     def _scrape_website_version(self):
         try:
             page = requests.get(WEBSITE_URL, timeout=10)
@@ -498,75 +681,12 @@ class Api:
                     with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
                         tmp_file_path = tmp_file.name
 
-                        with requests.get(url, stream=True, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT) as r:
-                            r.raise_for_status()
-                            total_size = int(r.headers.get('content-length', 0))
-                            downloaded = 0
-
-                            last_ui_update = 0.0
-
-                            if total_size > 0:
-                                size_mb = total_size // 1024**2
-                                self._send_js_update(
-                                    "updateProgress",
-                                    10,
-                                    self._msg("download_started", size_mb=size_mb),
-                                    0,
-                                    total_size
-                                )
-                                last_ui_update = time.time()
-
-                            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
-                                if self.installation_cancelled:
-                                    if backup_created:
-                                        self._restore_backup()
-                                    self._send_js_update("installCancelled")
-                                    return
-
-                                if not chunk:
-                                    continue
-
-                                tmp_file.write(chunk)
-                                downloaded += len(chunk)
-
-                                now = time.time()
-                                should_update = (now - last_ui_update) >= DOWNLOAD_PROGRESS_INTERVAL
-
-                                is_finished = (total_size > 0 and downloaded >= total_size)
-
-                                if not (should_update or is_finished):
-                                    continue
-
-                                last_ui_update = now
-
-                                if total_size > 0:
-                                    percent_total = int((downloaded / total_size) * 100)
-                                    download_percent = int((downloaded / total_size) * 80) + 10
-
-                                    self._send_js_update(
-                                        "updateProgress",
-                                        download_percent,
-                                        self._msg(
-                                            "downloading_from_server_percent",
-                                            server=attempt,
-                                            percent=percent_total
-                                        ),
-                                        downloaded,
-                                        total_size
-                                    )
-                                else:
-                                    mb = downloaded // 1024**2
-                                    self._send_js_update(
-                                        "updateProgress",
-                                        -1,
-                                        self._msg(
-                                            "downloading_from_server_mb",
-                                            server=attempt,
-                                            mb=mb
-                                        ),
-                                        downloaded,
-                                        downloaded * 2
-                                    )
+                        file_hash = self._stream_download(url, tmp_file, attempt, hashlib.sha256())
+                        if file_hash is None:
+                            if backup_created:
+                                self._restore_backup()
+                            self._send_js_update("installCancelled")
+                            return
 
                     download_successful = True
                     break
@@ -609,7 +729,7 @@ class Api:
             latest_version = self._scrape_website_version()
             if not latest_version:
                 latest_version = "Unknown"
-            self._set_local_version(mods_folder, latest_version)
+            self._set_local_version(target_file_path, latest_version, file_hash.hexdigest())
 
             self._send_js_update("installComplete", True, f"Installed version: {latest_version}")
 
@@ -627,13 +747,320 @@ class Api:
                     pass
             self.installation_cancelled = False
 
-    def _set_local_version(self, mods_folder, version_string):
-        status_file_path = self._get_status_file_path(mods_folder)
+    def _do_installer_update_task(self, info, filename):
         try:
-            with open(status_file_path, 'w') as f:
-                json.dump({"installed_version": version_string}, f, indent=2)
+            expected_sha256 = info.get("sha256")
+            expected_size = info.get("size")
+            release_key = info.get("version") or expected_sha256 or hashlib.sha256(info["url"].encode()).hexdigest()[:16]
+
+            staging_dir = self.state.state_dir / INSTALLER_UPDATE_DIR_NAME
+            release_dir = staging_dir / self._safe_file_name(release_key)
+            release_dir.mkdir(parents=True, exist_ok=True)
+            target_path = release_dir / filename
+
+            current_path = self._current_installer_path()
+            if current_path and target_path.resolve() == current_path:
+                raise Exception(f"Refusing to overwrite the running installer: {target_path}")
+
+            staged = (
+                expected_sha256
+                and target_path.exists()
+                and self._verify_file(target_path, expected_sha256, expected_size)
+            )
+
+            if not staged:
+                staged = self._apply_installer_patch(info, target_path)
+
+            if self.installation_cancelled:
+                self._send_js_update("installCancelled")
+                return
+
+            if not staged:
+                self._send_js_update("updateProgress", -1, self._msg("installer_update_downloading"), 0, 0)
+                staged = self._download_installer(
+                    info["url"],
+                    target_path,
+                    expected_sha256,
+                    expected_size,
+                    expected_sha256 or info.get("version")
+                )
+                if staged is None:
+                    self._send_js_update("installCancelled")
+                    return
+                if not staged:
+                    raise Exception(self._msg("installer_update_verify_failed"))
+
+            self._cleanup_staged_installers(staging_dir, release_dir)
+            self._send_js_update("updateProgress", 100, self._msg("installer_update_starting"), 0, 0)
+            self._launch_installer(target_path)
+            self.state.flush()
+            os._exit(0)
+        except Exception as e:
+            print(f"Installer update error: {e}")
+            self._send_js_update("installComplete", False, self._msg("installer_update_failed", error=str(e)))
+        finally:
+            self.installation_cancelled = False
+
+    def _download_installer(self, url, target_path, expected_sha256, expected_size, release_key=None):
+        part_path = None
+        if release_key:
+            part_path = target_path.with_name(f"{target_path.name}.{self._safe_file_name(release_key)}.part")
+
+        for path in target_path.parent.iterdir():
+            if path != part_path and path.name.startswith(target_path.name + ".") and path.name.endswith(".part"):
+                try:
+                    path.unlink()
+                except OSError as e:
+                    print(f"Error removing stale partial download {path}: {e}")
+
+        if part_path is None:
+            part_path = target_path.with_name(target_path.name + ".part")
+
+        offset = part_path.stat().st_size if release_key and part_path.exists() else 0
+
+        while True:
+            try:
+                hasher = self._hash_file(part_path) if offset else hashlib.sha256()
+                with open(part_path, "ab" if offset else "wb") as f:
+                    hasher = self._stream_download(
+                        url, f, 1, hasher, offset=offset, messages=INSTALLER_UPDATE_PROGRESS_MESSAGES
+                    )
+                if hasher is None:
+                    return None
+
+                self._send_js_update("updateProgress", 95, self._msg("installer_update_verifying"), 0, 0)
+                size_ok = expected_size is None or part_path.stat().st_size == expected_size
+                hash_ok = not expected_sha256 or hasher.hexdigest() == expected_sha256
+                if size_ok and hash_ok:
+                    os.replace(part_path, target_path)
+                    return True
+            except requests.RequestException:
+                raise
+            except Exception:
+                part_path.unlink(missing_ok=True)
+                raise
+
+            part_path.unlink()
+            if not offset:
+                print("Downloaded installer failed verification")
+                return False
+            print("Resumed installer failed verification, restarting download")
+            offset = 0
+
+    def _apply_installer_patch(self, info, target_path):
+        patch_info = (info.get("patches") or {}).get(INSTALLER_VERSION)
+        current_path = self._current_installer_path()
+        expected_sha256 = info.get("sha256")
+        if not patch_info or not patch_info.get("url") or not current_path or not expected_sha256:
+            return False
+
+        try:
+            self._send_js_update("updateProgress", -1, self._msg("installer_update_downloading_patch"), 0, 0)
+            patch_buffer = io.BytesIO()
+            patch_hash = self._stream_download(
+                patch_info["url"], patch_buffer, 1, hashlib.sha256(), messages=INSTALLER_UPDATE_PROGRESS_MESSAGES
+            )
+            if patch_hash is None:
+                return False
+
+            patch_sha256 = patch_info.get("sha256")
+            if patch_sha256 and patch_hash.hexdigest() != patch_sha256:
+                print("Update patch failed verification")
+                return False
+
+            self._send_js_update("updateProgress", 92, self._msg("installer_update_applying_patch"), 0, 0)
+            new_data = bsdiff4.patch(current_path.read_bytes(), patch_buffer.getvalue())
+            if hashlib.sha256(new_data).hexdigest() != expected_sha256:
+                print("Patched installer failed verification")
+                return False
+
+            part_path = target_path.with_name(target_path.name + ".part")
+            with open(part_path, "wb") as f:
+                f.write(new_data)
+            os.replace(part_path, target_path)
+            return True
+        except Exception as e:
+            print(f"Delta update failed, falling back to full download: {e}")
+            return False
+
+    def _cleanup_staged_installers(self, staging_dir, keep_dir):
+        current_path = self._current_installer_path()
+        for path in staging_dir.iterdir():
+            if path == keep_dir or (current_path and current_path.is_relative_to(path.resolve())):
+                continue
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                print(f"Removed old staged installer: {path}")
+            except OSError as e:
+                print(f"Error removing old staged installer {path}: {e}")
+
+    def _safe_file_name(self, value):
+        return re.sub(r'[^0-9A-Za-z._-]', '_', str(value))[:64]
+
+    def _current_installer_path(self):
+        exe_path = Path(sys.argv[0]).resolve()
+        if exe_path.suffix.lower() == ".py" or not exe_path.is_file():
+            return None
+        return exe_path
+
+    def _launch_installer(self, path):
+        if os.name == "nt":
+            os.startfile(str(path))
+        elif self._is_native_executable(path):
+            path.chmod(path.stat().st_mode | 0o111)
+            subprocess.Popen(
+                [str(path)],
+                cwd=str(path.parent),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        else:
+            opener = "open" if sys.platform == "darwin" else "xdg-open"
+            subprocess.Popen(
+                [opener, str(path)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+
+    def _is_native_executable(self, path):
+        try:
+            with open(path, "rb") as f:
+                magic = f.read(4)
+        except OSError:
+            return False
+        if sys.platform == "darwin":
+            return magic in (
+                b"\xcf\xfa\xed\xfe",
+                b"\xce\xfa\xed\xfe",
+                b"\xca\xfe\xba\xbe",
+                b"\xbe\xba\xfe\xca"
+            )
+        return magic == b"\x7fELF"
+
+    def _verify_file(self, path, expected_sha256, expected_size=None):
+        try:
+            if expected_size is not None and path.stat().st_size != expected_size:
+                return False
+            return self._hash_file(path).hexdigest() == expected_sha256
+        except OSError as e:
+            print(f"Error verifying {path}: {e}")
+            return False
+
+    def _hash_file(self, path):
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024**2), b""):
+                hasher.update(block)
+        return hasher
+
+    def _stream_download(self, url, out_file, server, hasher, offset=0, messages=DOWNLOAD_PROGRESS_MESSAGES):
+        started_key, percent_key, mb_key = messages
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with requests.get(url, stream=True, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT, headers=headers) as r:
+            if offset and r.status_code == 416:
+                remote_size = r.headers.get('content-range', '').rpartition('/')[2]
+                if remote_size == str(offset):
+                    return hasher
+                print("Partial download does not match server file, restarting download")
+                out_file.seek(0)
+                out_file.truncate()
+                return self._stream_download(url, out_file, server, hashlib.new(hasher.name), messages=messages)
+
+            r.raise_for_status()
+            if offset and r.status_code != 206:
+                print("Server does not support resuming, restarting download")
+                out_file.seek(0)
+                out_file.truncate()
+                offset = 0
+                hasher = hashlib.new(hasher.name)
+
+            content_length = int(r.headers.get('content-length', 0))
+            total_size = offset + content_length if content_length > 0 else 0
+            downloaded = offset
+
+            last_ui_update = 0.0
+
+            if total_size > 0:
+                size_mb = total_size // 1024**2
+                self._send_js_update(
+                    "updateProgress",
+                    10,
+                    self._msg(started_key, size_mb=size_mb),
+                    downloaded,
+                    total_size
+                )
+                last_ui_update = time.time()
+
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if self.installation_cancelled:
+                    return None
+
+                if not chunk:
+                    continue
+
+                out_file.write(chunk)
+                hasher.update(chunk)
+                downloaded += len(chunk)
+
+                now = time.time()
+                should_update = (now - last_ui_update) >= DOWNLOAD_PROGRESS_INTERVAL
+
+                is_finished = (total_size > 0 and downloaded >= total_size)
+
+                if not (should_update or is_finished):
+                    continue
+
+                last_ui_update = now
+
+                if total_size > 0:
+                    percent_total = int((downloaded / total_size) * 100)
+                    download_percent = int((downloaded / total_size) * 80) + 10
+
+                    self._send_js_update(
+                        "updateProgress",
+                        download_percent,
+                        self._msg(
+                            percent_key,
+                            server=server,
+                            percent=percent_total
+                        ),
+                        downloaded,
+                        total_size
+                    )
+                else:
+                    mb = downloaded // 1024**2
+                    self._send_js_update(
+                        "updateProgress",
+                        -1,
+                        self._msg(
+                            mb_key,
+                            server=server,
+                            mb=mb
+                        ),
+                        downloaded,
+                        downloaded * 2
+                    )
+
+        return hasher
+
+    def _set_local_version(self, mod_file_path, version_string, sha256=None):
+        try:
+            mod_stat = mod_file_path.stat()
         except OSError as e:
-            print(f"Error writing status JSON: {e}")
+            print(f"Error reading installed mod file: {e}")
+            mod_stat = None
+        self.state.update(
+            installed_version=version_string,
+            game_path=str(self.selected_game_folder),
+            mod_size=mod_stat.st_size if mod_stat else None,
+            mod_mtime_ns=mod_stat.st_mtime_ns if mod_stat else None,
+            mod_sha256=sha256
+        )
+        self.state.flush()
 
     def _send_js_update(self, function_name, *args):
         if self.window:
@@ -682,3 +1109,4 @@ if __name__ == '__main__':
         print("API functions exposed")
 
     webview.start(expose_api, main_window, debug=False)
+    api.state.flush()